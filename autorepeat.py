@@ -0,0 +1,35 @@
+from enum import Enum
+
+_SERVER_TIME_MASK = 0xFFFFFFFF
+
+
+def elapsed_ms(since: int, until: int) -> int:
+    # Server time is in milliseconds and wraps around every ~49 days
+    return (until - since) & _SERVER_TIME_MASK
+
+
+class AutorepeatPolicy(Enum):
+    IGNORE = 'ignore'
+    THROTTLE = 'throttle'
+
+
+class AutorepeatFilter:
+
+    def __init__(self, policy: AutorepeatPolicy, cycles_per_second: float):
+        if cycles_per_second <= 0:
+            raise ValueError(f'Autorepeat cycles per second must be positive, got {cycles_per_second}')
+        self._policy = policy
+        self._cycle_interval_ms = 1000 / cycles_per_second
+        self._last_accepted_times = {}
+
+    def accept(self, keys: str, event_time: int, is_repeat: bool) -> bool:
+        if not is_repeat:
+            self._last_accepted_times[keys] = event_time
+            return True
+
+        last_accepted_time = self._last_accepted_times.get(keys)
+        if self._policy == AutorepeatPolicy.THROTTLE and (
+                last_accepted_time is None or elapsed_ms(last_accepted_time, event_time) >= self._cycle_interval_ms):
+            self._last_accepted_times[keys] = event_time
+            return True
+        return False
@@ -0,0 +1,23 @@
+#!/bin/bash
+# Compares the interpreter start-up overhead of launching MonKey through pipenv and through the cached interpreter
+# used by files/monkey-run.sh.
+#
+# Run from the repository root:
+#     benchmarks/cold_start.sh
+set -e
+
+RUNS=10
+PYTHON="$(pipenv --py)"
+
+time_runs() {
+    local start end
+    start=$(date +%s.%N)
+    for _ in $(seq $RUNS); do
+        "$@" > /dev/null
+    done
+    end=$(date +%s.%N)
+    echo "scale=3; ($end - $start) / $RUNS" | bc
+}
+
+echo "pipenv run:         $(time_runs pipenv run python -c 'import monkey')s"
+echo "cached interpreter: $(time_runs "$PYTHON" -c 'import monkey')s"
@@ -0,0 +1,93 @@
+"""
+Measures the latency from a hold key release to its callback on the GTK main loop, while the main loop is kept busy,
+for the hold keys listener running in a thread and in a child process.
+
+Run from the repository root inside an X session:
+    python benchmarks/hold_listener_latency.py
+"""
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from Xlib import X
+from Xlib.display import Display
+from Xlib.ext import xtest
+
+import keys
+from xlib_key_binder import XlibKeyBinder
+
+import gi
+gi.require_versions({"Gtk": "3.0"})
+from gi.repository import GLib, Gtk
+
+_SAMPLES = 100
+_BUSY_SLICE_SECONDS = 0.005
+_RELEASE_TIMEOUT_SECONDS = 2
+
+
+def _keep_main_loop_busy():
+    # Simulates Glade parsing and Wnck callbacks hogging the main thread and the GIL
+    deadline = time.perf_counter() + _BUSY_SLICE_SECONDS
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+    return True
+
+
+def _inject_releases(keycode, released, latencies):
+    display = Display()
+    for _ in range(_SAMPLES):
+        released.clear()
+        xtest.fake_input(display, X.KeyPress, keycode)
+        display.sync()
+        time.sleep(0.01)
+        released_at = time.perf_counter()
+        xtest.fake_input(display, X.KeyRelease, keycode)
+        display.sync()
+        if released.wait(_RELEASE_TIMEOUT_SECONDS):
+            latencies.append(released.callback_time - released_at)
+    display.close()
+    GLib.idle_add(Gtk.main_quit)
+
+
+def measure(listener_process_keysyms):
+    key_binder = XlibKeyBinder(listener_process_keysyms)
+    released = threading.Event()
+    latencies = []
+
+    def released_callback(_timestamp):
+        released.callback_time = time.perf_counter()
+        released.set()
+
+    key_binder.listen_hold(keys.ESC_KEY, None, released_callback)
+    key_binder.start()
+    # Let the listener create its record context before injecting keys
+    time.sleep(1)
+
+    busy_source = GLib.idle_add(_keep_main_loop_busy)
+    keycode = Display().keysym_to_keycode(keys.ESC_KEY)
+    threading.Thread(target=_inject_releases, args=(keycode, released, latencies), daemon=True).start()
+    Gtk.main()
+    GLib.source_remove(busy_source)
+    key_binder.stop()
+    return latencies
+
+
+def _report(name, latencies):
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    print(f'{name}: {len(latencies_ms)}/{_SAMPLES} releases, '
+          f'median {statistics.median(latencies_ms):.2f}ms, '
+          f'p95 {latencies_ms[int(len(latencies_ms) * 0.95) - 1]:.2f}ms, '
+          f'max {latencies_ms[-1]:.2f}ms')
+
+
+def main():
+    _report('thread', measure(None))
+    _report('process', measure(keys.HOLD_KEYS))
+
+
+if __name__ == '__main__':
+    main()
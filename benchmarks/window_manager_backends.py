@@ -0,0 +1,88 @@
+"""
+Compares the window manager backends' startup time, resident memory and the CPU time they spend handling focus changes.
+Each backend is measured in its own interpreter, so neither benefits from what the other loaded.
+
+Run from the repository root inside an X session with at least two windows open:
+    python benchmarks/window_manager_backends.py
+"""
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+_BACKENDS = ['wnck', 'ewmh']
+_FOCUS_CHANGES = 50
+_FOCUS_CHANGE_TIMEOUT_SECONDS = 2
+
+
+def _max_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _wait_for_active_window(window_manager, window):
+    from gi.repository import GLib
+
+    # Blocking iterations keep the wait itself from adding CPU time, the timeout wakes them up if the focus never changes
+    timed_out = []
+    timeout_source = GLib.timeout_add_seconds(_FOCUS_CHANGE_TIMEOUT_SECONDS, timed_out.append, True)
+    while window_manager.get_active_window() != window and not timed_out:
+        GLib.MainContext.default().iteration(True)
+    if not timed_out:
+        GLib.source_remove(timeout_source)
+
+
+def measure(backend):
+    import gi
+    gi.require_versions({"Gtk": "3.0"})
+    from gi.repository import Gtk
+    from hotkey import ALL_WINDOWS
+    from monkey import MonKey
+
+    Gtk.init([])
+    # The backend modules are imported by create_window_manager, so loading their libraries is measured too
+    baseline_rss = _max_rss_mb()
+    started_at = time.perf_counter()
+    window_manager = MonKey.create_window_manager(backend)
+    window_manager.start()
+    startup_seconds = time.perf_counter() - started_at
+    startup_rss = _max_rss_mb() - baseline_rss
+
+    windows = window_manager.get_windows(ALL_WINDOWS)[:2]
+    if len(windows) < 2:
+        raise RuntimeError('At least two windows need to be open')
+    # Only the time spent in this process counts, not the time the window manager takes to change the focus
+    cpu_started_at = time.process_time()
+    for focus_change in range(_FOCUS_CHANGES):
+        window = windows[focus_change % 2]
+        window_manager.activate_window(window, 0)
+        _wait_for_active_window(window_manager, window)
+    update_cpu_seconds = (time.process_time() - cpu_started_at) / _FOCUS_CHANGES
+
+    return {
+        'startup_ms': startup_seconds * 1000,
+        'startup_rss_mb': startup_rss,
+        'focus_change_cpu_ms': update_cpu_seconds * 1000,
+        'windows': len(window_manager.get_windows(ALL_WINDOWS)),
+    }
+
+
+def main():
+    if len(sys.argv) > 1:
+        print(json.dumps(measure(sys.argv[1])))
+        return
+
+    for backend in _BACKENDS:
+        output = subprocess.run([sys.executable, __file__, backend], check=True, capture_output=True, text=True).stdout
+        results = json.loads(output.splitlines()[-1])
+        print(f'{backend}: {results["windows"]} windows, '
+              f'startup {results["startup_ms"]:.1f}ms, '
+              f'startup RSS +{results["startup_rss_mb"]:.1f}MB, '
+              f'focus change {results["focus_change_cpu_ms"]:.2f}ms CPU')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,18 @@
 import json
+import logging
 import os
 from pathlib import Path
 from typing import List
 
+from autorepeat import AutorepeatPolicy
 from hotkey import Hotkey
 from keys import Modifier
 
 DEFAULT_MODIFIER = Modifier.SUPER
+DEFAULT_WINDOW_MANAGER_BACKEND = 'wnck'
+WINDOW_MANAGER_BACKENDS = ['wnck', 'ewmh']
+DEFAULT_AUTOREPEAT_POLICY = AutorepeatPolicy.THROTTLE
+DEFAULT_AUTOREPEAT_CYCLES_PER_SECOND = 8
 
 
 class Configuration:
@@ -22,12 +28,45 @@ class Configuration:
             with self._HOTKEYS_FILE.open('w') as hotkeys_file:
                 json.dump({
                     'modifier': DEFAULT_MODIFIER.name,
-                    'hotkeys': []
+                    'hotkeys': [],
+                    'hold_listener_child_process': False,
+                    'window_manager_backend': DEFAULT_WINDOW_MANAGER_BACKEND,
+                    'autorepeat_policy': DEFAULT_AUTOREPEAT_POLICY.value,
+                    'autorepeat_cycles_per_second': DEFAULT_AUTOREPEAT_CYCLES_PER_SECOND
                 }, hotkeys_file)
 
     def modifier(self) -> Modifier:
         return Modifier[self._read_configuration()['modifier']]
 
+    def hold_listener_child_process(self) -> bool:
+        return self._read_configuration().get('hold_listener_child_process', False)
+
+    def window_manager_backend(self) -> str:
+        backend = self._read_configuration().get('window_manager_backend', DEFAULT_WINDOW_MANAGER_BACKEND)
+        if backend not in WINDOW_MANAGER_BACKENDS:
+            logging.warning(f'Ignoring window_manager_backend {backend!r}, it must be one of '
+                            f'{", ".join(repr(valid_backend) for valid_backend in WINDOW_MANAGER_BACKENDS)}')
+            return DEFAULT_WINDOW_MANAGER_BACKEND
+        return backend
+
+    def autorepeat_policy(self) -> AutorepeatPolicy:
+        policy = self._read_configuration().get('autorepeat_policy', DEFAULT_AUTOREPEAT_POLICY.value)
+        try:
+            return AutorepeatPolicy(policy)
+        except ValueError:
+            logging.warning(f'Ignoring autorepeat_policy {policy!r}, it must be one of '
+                            f'{", ".join(repr(valid_policy.value) for valid_policy in AutorepeatPolicy)}')
+            return DEFAULT_AUTOREPEAT_POLICY
+
+    def autorepeat_cycles_per_second(self) -> float:
+        cycles_per_second = self._read_configuration().get('autorepeat_cycles_per_second',
+                                                           DEFAULT_AUTOREPEAT_CYCLES_PER_SECOND)
+        if not isinstance(cycles_per_second, (int, float)) or cycles_per_second <= 0:
+            logging.warning(f'Ignoring autorepeat_cycles_per_second {cycles_per_second!r}, it must be a positive '
+                            f'number')
+            return DEFAULT_AUTOREPEAT_CYCLES_PER_SECOND
+        return cycles_per_second
+
     def hotkeys(self) -> List[Hotkey]:
         return [Hotkey(*x) for x in self._read_configuration()['hotkeys']]
 
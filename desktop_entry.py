@@ -12,7 +12,7 @@ class DesktopEntry:
 
     _FILES_PATH = Path(__file__).parent / 'files'
     ICON_PATH = _FILES_PATH / 'monkey-head.png'
-    _SCRIPT_PATH = _FILES_PATH / 'monkey_run.sh'
+    _SCRIPT_PATH = _FILES_PATH / 'monkey-run.sh'
 
     def is_installed(self) -> bool:
         return self._ENTRY_PATH.exists()
@@ -0,0 +1,27 @@
+from Xlib import X
+from Xlib.protocol import event
+
+# Tells the window manager the request comes from a pager, which is what window switchers are
+_SOURCE_INDICATION_PAGER = 2
+_ROOT_MESSAGE_MASK = X.SubstructureRedirectMask | X.SubstructureNotifyMask
+
+
+class EwmhRequests:
+
+    def __init__(self, display):
+        self._display = display
+        self._root = display.screen().root
+        self._net_active_window = display.intern_atom('_NET_ACTIVE_WINDOW')
+        self._net_current_desktop = display.intern_atom('_NET_CURRENT_DESKTOP')
+
+    def activate_window(self, xid, timestamp, desktop=None):
+        # Both requests are only queued, then sent together in one flush without waiting for any reply
+        if desktop is not None:
+            self._send_root_message(self._root, self._net_current_desktop, [desktop, timestamp, 0, 0, 0])
+        window = self._display.create_resource_object('window', xid)
+        self._send_root_message(window, self._net_active_window, [_SOURCE_INDICATION_PAGER, timestamp, 0, 0, 0])
+        self._display.flush()
+
+    def _send_root_message(self, window, message_type, data):
+        message = event.ClientMessage(window=window, client_type=message_type, data=(32, data))
+        self._root.send_event(message, event_mask=_ROOT_MESSAGE_MASK)
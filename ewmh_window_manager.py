@@ -0,0 +1,180 @@
+import logging
+from typing import Optional
+
+from Xlib import X, Xatom
+from Xlib.display import Display
+from Xlib.error import XError
+
+from gi.repository import GLib
+
+from ewmh import EwmhRequests
+from window_manager import WindowManager
+from window_record import WindowRecord
+
+# Value of _NET_WM_DESKTOP for windows shown on all the workspaces
+_ALL_DESKTOPS = 0xFFFFFFFF
+
+
+# Tracks the client windows through the window manager's EWMH root properties and PropertyNotify events, reading only
+# the class, title, workspace and stacking of each window
+class EwmhWindowManager(WindowManager):
+
+    def __init__(self):
+        super().__init__()
+        self._display = Display()
+        self._display.set_error_handler(self._x_error)
+        self._root = self._display.screen().root
+        self._ewmh_requests = EwmhRequests(self._display)
+        self._atoms = {name: self._display.intern_atom(name) for name in [
+            '_NET_CLIENT_LIST', '_NET_CLIENT_LIST_STACKING', '_NET_ACTIVE_WINDOW', '_NET_CURRENT_DESKTOP',
+            '_NET_DESKTOP_NAMES', '_NET_NUMBER_OF_DESKTOPS', '_NET_WM_NAME', '_NET_WM_DESKTOP', '_NET_WM_PID',
+            'UTF8_STRING',
+        ]}
+        self._workspace_names = []
+        self._current_workspace = 0
+        self._active_window = None
+
+    def start(self):
+        self._root.change_attributes(event_mask=X.PropertyChangeMask)
+        self._read_workspaces()
+        # Adding the windows bottom to top leaves the topmost window as the most recently used one
+        stacked_windows = self._get_root_property('_NET_CLIENT_LIST_STACKING') \
+            or self._get_root_property('_NET_CLIENT_LIST')
+        for xid in stacked_windows:
+            window = self._read_client_window(xid)
+            if window:
+                self._add_window(window)
+        self._read_active_window()
+
+        GLib.io_add_watch(self._display.fileno(), GLib.PRIORITY_DEFAULT, GLib.IOCondition.IN, self._x_events_ready)
+        self._x_events_ready()
+
+    def get_active_window(self) -> Optional[WindowRecord]:
+        return self._active_window
+
+    def activate_window(self, window: WindowRecord, timestamp: int):
+        if window.workspace_number is not None and window.workspace_number != self._current_workspace:
+            self._ewmh_requests.activate_window(window.xid, timestamp, window.workspace_number)
+        else:
+            self._ewmh_requests.activate_window(window.xid, timestamp)
+
+    def get_icon(self, window: WindowRecord):
+        # Icons are what makes Wnck heavy, the popup does without them
+        return None
+
+    def _x_events_ready(self, *_):
+        # Replies read while handling an event may queue more events, so they are all drained here
+        while self._display.pending_events():
+            event = self._display.next_event()
+            if event.type == X.PropertyNotify:
+                self._property_changed(event.window.id, event.atom)
+        return True
+
+    def _property_changed(self, xid, atom):
+        if xid == self._root.id:
+            if atom == self._atoms['_NET_CLIENT_LIST']:
+                self._read_client_list()
+            elif atom == self._atoms['_NET_ACTIVE_WINDOW']:
+                self._read_active_window()
+            elif atom == self._atoms['_NET_CURRENT_DESKTOP']:
+                self._current_workspace = self._get_root_property('_NET_CURRENT_DESKTOP', [0])[0]
+            elif atom in (self._atoms['_NET_DESKTOP_NAMES'], self._atoms['_NET_NUMBER_OF_DESKTOPS']):
+                self._read_workspaces()
+        elif xid in self._records:
+            try:
+                self._client_property_changed(self._records[xid], atom)
+            except XError:
+                # The window was destroyed, it will be removed once the client list changes
+                pass
+
+    def _client_property_changed(self, window: WindowRecord, atom):
+        x_window = self._display.create_resource_object('window', window.xid)
+        if atom in (self._atoms['_NET_WM_NAME'], Xatom.WM_NAME):
+            window.title = self._read_name(x_window)
+            self._record_changed(window)
+        elif atom == self._atoms['_NET_WM_DESKTOP']:
+            window.workspace_number = self._read_workspace(x_window)
+            window.workspace_name = self._workspace_name(window.workspace_number)
+            self._record_changed(window)
+        elif atom == Xatom.WM_CLASS:
+            self._window_class_changed(window, self._read_class_name(x_window))
+
+    def _read_client_list(self):
+        client_list = set(self._get_root_property('_NET_CLIENT_LIST'))
+        for xid in set(self._records) - client_list:
+            self._window_closed(self._records.pop(xid))
+        for xid in client_list - set(self._records):
+            window = self._read_client_window(xid)
+            if window:
+                self._window_opened(window)
+
+    def _read_active_window(self):
+        active_xid = self._get_root_property('_NET_ACTIVE_WINDOW', [X.NONE])[0]
+        self._active_window = self._records.get(active_xid)
+        if self._active_window:
+            self._window_activated(self._active_window)
+
+    def _read_workspaces(self):
+        names_property = self._root.get_full_property(self._atoms['_NET_DESKTOP_NAMES'], self._atoms['UTF8_STRING'])
+        names = names_property.value.decode('utf-8', 'replace').split('\0') if names_property else []
+        count = self._get_root_property('_NET_NUMBER_OF_DESKTOPS', [len(names)])[0]
+        self._workspace_names = [names[number] if number < len(names) else f'Workspace {number + 1}'
+                                 for number in range(count)]
+        self._current_workspace = self._get_root_property('_NET_CURRENT_DESKTOP', [0])[0]
+        for window in self._records.values():
+            workspace_name = self._workspace_name(window.workspace_number)
+            if window.workspace_name != workspace_name:
+                window.workspace_name = workspace_name
+                self._record_changed(window)
+
+    def _read_client_window(self, xid) -> Optional[WindowRecord]:
+        x_window = self._display.create_resource_object('window', xid)
+        try:
+            x_window.change_attributes(event_mask=X.PropertyChangeMask)
+            pid_property = x_window.get_full_property(self._atoms['_NET_WM_PID'], Xatom.CARDINAL)
+            workspace_number = self._read_workspace(x_window)
+            window = WindowRecord(xid, pid_property.value[0] if pid_property else 0, self._read_class_name(x_window),
+                                  self._read_name(x_window), workspace_number,
+                                  self._workspace_name(workspace_number))
+        except XError:
+            # Windows may be destroyed between being listed and being read
+            return None
+        self._records[xid] = window
+        return window
+
+    @staticmethod
+    def _read_class_name(x_window) -> str:
+        wm_class = x_window.get_wm_class()
+        return wm_class[1] if wm_class else ''
+
+    def _read_name(self, x_window) -> str:
+        name_property = x_window.get_full_property(self._atoms['_NET_WM_NAME'], self._atoms['UTF8_STRING'])
+        if name_property:
+            return name_property.value.decode('utf-8', 'replace')
+        name_property = x_window.get_full_property(Xatom.WM_NAME, X.AnyPropertyType)
+        if name_property:
+            return name_property.value.decode('latin-1') if isinstance(name_property.value, bytes) \
+                else str(name_property.value)
+        return ''
+
+    def _read_workspace(self, x_window) -> Optional[int]:
+        desktop_property = x_window.get_full_property(self._atoms['_NET_WM_DESKTOP'], Xatom.CARDINAL)
+        if not desktop_property or desktop_property.value[0] == _ALL_DESKTOPS:
+            return None
+        return desktop_property.value[0]
+
+    def _workspace_name(self, number: Optional[int]) -> str:
+        if number is None:
+            return ''
+        if number < len(self._workspace_names):
+            return self._workspace_names[number]
+        return f'Workspace {number + 1}'
+
+    def _get_root_property(self, name, default=()):
+        root_property = self._root.get_full_property(self._atoms[name], X.AnyPropertyType)
+        return list(root_property.value) if root_property else list(default)
+
+    @staticmethod
+    def _x_error(error: XError, _request):
+        # Requests without replies may fail on windows that were destroyed meanwhile
+        logging.debug(f'Ignoring X error {error}')
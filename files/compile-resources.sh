@@ -0,0 +1,13 @@
+#!/bin/bash
+# Compiles the Glade files, style sheet and logo into the resources bundle MonKey loads at startup.
+# Run it after installing or changing any of them, files/monkey-run.sh runs it whenever the bundle is outdated.
+set -e # Exit script if any command fail
+
+cd "$(dirname "$0")/.."
+
+if ! command -v glib-compile-resources > /dev/null; then
+    echo "glib-compile-resources was not found, install libglib2.0-bin to build MonKey's UI resources" >&2
+    exit 1
+fi
+glib-compile-resources --target=ui/monkey.gresource --sourcedir=ui/glade_files --sourcedir=files \
+    ui/monkey.gresource.xml
@@ -2,4 +2,27 @@
 set -e # Exit script if any command fail
 
 cd "$(dirname "$0")/.."
-pipenv run python monkey.py
+
+# Resolving the virtualenv through pipenv takes about a second, so its interpreter is looked up once and then
+# started directly. The lookup is redone whenever the cached interpreter disappears.
+PYTHON_PATH_FILE=".python-path"
+if [ ! -x "$(cat "$PYTHON_PATH_FILE" 2>/dev/null)" ]; then
+    pipenv --py > "$PYTHON_PATH_FILE"
+fi
+# The UI resources bundle is rebuilt here, before MonKey starts, whenever it's missing or older than its sources.
+# MonKey itself only loads it.
+BUNDLE="ui/monkey.gresource"
+# Only the files listed in the manifest are compiled into the bundle, editing any other file doesn't outdate it
+BUNDLE_SOURCES=(ui/monkey.gresource.xml)
+for NAME in $(sed -n 's:.*<file>\(.*\)</file>.*:\1:p' ui/monkey.gresource.xml); do
+    for SOURCE_DIR in ui/glade_files files; do
+        if [ -e "$SOURCE_DIR/$NAME" ]; then
+            BUNDLE_SOURCES+=("$SOURCE_DIR/$NAME")
+        fi
+    done
+done
+if [ ! -e "$BUNDLE" ] || [ -n "$(find "${BUNDLE_SOURCES[@]}" -newer "$BUNDLE" -print -quit)" ]; then
+    files/compile-resources.sh
+fi
+
+exec "$(cat "$PYTHON_PATH_FILE")" monkey.py
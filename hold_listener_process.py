@@ -0,0 +1,66 @@
+import os
+import signal
+import struct
+import sys
+import threading
+
+from Xlib import X
+from Xlib.display import Display
+from Xlib.ext import record
+from Xlib.protocol import rq
+
+# Each forwarded key event is written to stdout as one fixed size record of (keysym, event type, server time)
+EVENT_FORMAT = '=IBI'
+EVENT_SIZE = struct.calcsize(EVENT_FORMAT)
+
+RECORD_RANGES = [{
+    'core_requests': (0, 0),
+    'core_replies': (0, 0),
+    'ext_requests': (0, 0, 0, 0),
+    'ext_replies': (0, 0, 0, 0),
+    'delivered_events': (0, 0),
+    'device_events': (X.KeyReleaseMask, X.ButtonReleaseMask),
+    'errors': (0, 0),
+    'client_started': False,
+    'client_died': False,
+}]
+
+
+def listen(keysyms):
+    display = Display()
+    context = display.record_create_context(0, [record.AllClients], RECORD_RANGES)
+    # MonKey writes the keysyms of the bound hotkeys to stdin, one line whenever they change. Their releases tell
+    # autorepeated hotkey presses from deliberate ones, the releases of any other key are of no interest to MonKey.
+    bindings_keysyms = frozenset()
+
+    def read_bindings_keysyms():
+        nonlocal bindings_keysyms
+        for line in sys.stdin:
+            bindings_keysyms = frozenset(int(keysym) for keysym in line.split())
+
+    threading.Thread(target=read_bindings_keysyms, daemon=True).start()
+
+    def event_handler(reply):
+        data = reply.data
+        while len(data):
+            event, data = rq.EventField(None).parse_binary_value(data, display.display, None, None)
+            if event.type not in (X.KeyPress, X.KeyRelease):
+                continue
+            keysym = display.keycode_to_keysym(event.detail, 0)
+            if keysym in keysyms or (event.type == X.KeyRelease and keysym in bindings_keysyms):
+                os.write(sys.stdout.fileno(), struct.pack(EVENT_FORMAT, keysym, event.type, event.time))
+
+    try:
+        display.record_enable_context(context, event_handler)
+    except BrokenPipeError:
+        # MonKey exited, nobody is reading our events anymore
+        pass
+    finally:
+        display.record_free_context(context)
+        display.close()
+
+
+if __name__ == '__main__':
+    # Interrupts are handled by MonKey, which stops this process itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    listen({int(keysym) for keysym in sys.argv[1:]})
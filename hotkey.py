@@ -1,5 +1,10 @@
 from dataclasses import dataclass
 
+# Special window class names, a hotkey bound to one of them cycles windows across classes
+ALL_WINDOWS = '@all'
+RECENT_WINDOW_PER_CLASS = '@classes'
+CROSS_CLASS_NAMES = (ALL_WINDOWS, RECENT_WINDOW_PER_CLASS)
+
 
 @dataclass
 class Hotkey:
@@ -1,6 +1,7 @@
 import logging
 
 import keys
+from autorepeat import AutorepeatFilter
 from configuration import Configuration
 from keylistener import KeyListener
 from xlib_key_binder import XlibKeyBinder
@@ -10,7 +11,9 @@ class KeyBinder:
     def __init__(self, configuration: Configuration, key_listener: KeyListener):
         self._configuration = configuration
         self._key_listener = key_listener
-        self._xkey_binder = XlibKeyBinder()
+        listener_process_keysyms = keys.HOLD_KEYS if configuration.hold_listener_child_process() else None
+        self._xkey_binder = XlibKeyBinder(listener_process_keysyms)
+        self._autorepeat_filter = None
 
     def start(self):
         self._xkey_binder.start()
@@ -23,15 +26,22 @@ class KeyBinder:
         self._xkey_binder.clear_listen_hold()
         self._xkey_binder.clear_bindings()
 
+        self._autorepeat_filter = AutorepeatFilter(self._configuration.autorepeat_policy(),
+                                                   self._configuration.autorepeat_cycles_per_second())
         modifier = self._configuration.modifier()
         self._xkey_binder.listen_hold(modifier.xk_value,
                                       self._key_listener.modifier_down, self._key_listener.modifier_up)
-        self._xkey_binder.listen_hold(keys.ESC_KEY, self._key_listener.escape_pressed, lambda: None)
+        self._xkey_binder.listen_hold(keys.ESC_KEY, self._key_listener.escape_pressed, lambda _: None)
 
         for hotkey in self._configuration.hotkeys():
             hotkey_string = modifier.string_value + hotkey.key
             logging.debug(f'Binding key {hotkey_string} to open {hotkey.window_class_name}')
-            if not self._xkey_binder.bind_to_keys(hotkey_string, self._key_listener.hotkey_pressed,
-                                                  hotkey.window_class_name):
+            if not self._xkey_binder.bind_to_keys(hotkey_string, self._hotkey_pressed, hotkey.window_class_name):
                 logging.info(f'Failed binding key {hotkey_string} to open {hotkey.window_class_name}')
 
+    def _hotkey_pressed(self, key_combination: str, window_class_name: str):
+        # Holding a hotkey makes X repeat it, each repeat would cycle the windows and repaint the popup
+        is_repeat = self._xkey_binder.is_autorepeat(key_combination)
+        if self._autorepeat_filter.accept(key_combination, self._xkey_binder.current_event_time(), is_repeat):
+            self._key_listener.hotkey_pressed(key_combination, window_class_name)
+
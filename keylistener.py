@@ -5,15 +5,15 @@ from abc import ABC
 class KeyListener(ABC):
 
     @abc.abstractmethod
-    def modifier_down(self):
+    def modifier_down(self, timestamp: int):
         pass
 
     @abc.abstractmethod
-    def modifier_up(self):
+    def modifier_up(self, timestamp: int):
         pass
 
     @abc.abstractmethod
-    def escape_pressed(self):
+    def escape_pressed(self, timestamp: int):
         pass
 
     @abc.abstractmethod
@@ -13,3 +13,6 @@ class Modifier(Enum):
         self.string_value = string_value
         self.xk_value = xk_value
 
+
+# Every key that may be listened for being held, the listener process forwards only presses of these
+HOLD_KEYS = frozenset([modifier.xk_value for modifier in Modifier] + [ESC_KEY])
@@ -1,4 +1,5 @@
 import faulthandler
+import importlib
 import logging
 import logging.handlers
 import os
@@ -12,13 +13,15 @@ import gi
 from configuration import Configuration
 from key_binder import KeyBinder
 from keylistener import KeyListener
+from recent_windows_store import RecentWindowsStore
+from ui import resources
 from ui.tray_icon import TrayIcon
 from window_manager import WindowManager
 from windows_switcher import WindowsSwitcher
 
-gi.require_versions({"Gtk": "3.0", "Wnck": "3.0"})
+gi.require_versions({"Gtk": "3.0"})
 # noinspection PyUnresolvedReferences
-from gi.repository import Gtk, Wnck, GdkX11, Gdk, GLib
+from gi.repository import Gtk
 
 faulthandler.enable()
 
@@ -26,24 +29,41 @@ faulthandler.enable()
 class MonKey(KeyListener):
     _XDG_DATA_HOME = Path(os.environ.get('XDG_DATA_HOME', os.path.expanduser("~/.local/share"))) / 'MonKey'
     _LOG_PATH = _XDG_DATA_HOME / 'monkey.log'
+    _RECENT_WINDOWS_PATH = _XDG_DATA_HOME / 'recent-windows.json'
     _LOG_FORMAT = "%(asctime)s %(levelname)s - %(name)s - %(message)s"
+    # Only the configured backend is imported, so libwnck isn't loaded at all with the ewmh backend
+    _WINDOW_MANAGER_BACKENDS = {
+        'wnck': ('wnck_window_manager', 'WnckWindowManager'),
+        'ewmh': ('ewmh_window_manager', 'EwmhWindowManager'),
+    }
 
     def __init__(self):
-        self._window_manager: WindowManager = WindowManager()
+        # Logging is set up first, building the window manager and restoring its order already logs
+        self._initialize_logging()
+        self._configuration = Configuration()
+        self._window_manager: WindowManager = self.create_window_manager(
+            self._configuration.window_manager_backend())
         self._window_manager.start()
+        self._recent_windows_store = RecentWindowsStore(self._RECENT_WINDOWS_PATH, self._window_manager)
+        self._window_manager.restore_recent_windows(self._recent_windows_store.load())
         self._windows_switcher: Optional[WindowsSwitcher] = None
-        self._configuration = Configuration()
         self._key_binder = KeyBinder(self._configuration, self)
         self._tray_icon = TrayIcon(self._configuration, self._key_binder)
 
+    @classmethod
+    def create_window_manager(cls, backend: str) -> WindowManager:
+        module_name, class_name = cls._WINDOW_MANAGER_BACKENDS[backend]
+        return getattr(importlib.import_module(module_name), class_name)()
+
     def start(self):
-        self._initialize_logging()
         self._tray_icon.show()
         Gtk.init([])
 
         self._key_binder.start()
+        self._recent_windows_store.start()
 
         Gtk.main()
+        self._recent_windows_store.stop()
         self._key_binder.stop()
 
     def _initialize_logging(self):
@@ -79,14 +99,10 @@ class MonKey(KeyListener):
         self._windows_switcher = WindowsSwitcher(self._window_manager)
         self._windows_switcher.open(window_class_name)
 
-    def _get_server_time(self):
-        server_time = GdkX11.x11_get_server_time(Gdk.get_default_root_window())
-        return server_time
-
-    def modifier_down(self):
+    def modifier_down(self, timestamp: int):
         pass
 
-    def modifier_up(self):
+    def modifier_up(self, timestamp: int):
         if not self._windows_switcher:
             return
 
@@ -94,24 +110,29 @@ class MonKey(KeyListener):
         self._close_windows_switcher()
 
         if selected_window:
-            GLib.idle_add(self._activate_window, selected_window)
+            # The release event's server time is used, which saves a round-trip to the X server for the current time
+            self._activate_window(selected_window, timestamp)
 
-    def _activate_window(self, window):
-        window.activate(self._get_server_time())
-        print(f'\t{str(datetime.now())}: Focus {window.get_class_group_name()}: {window.get_name()}')
+    def _activate_window(self, window, timestamp: int):
+        self._window_manager.activate_window(window, timestamp)
+        print(f'\t{str(datetime.now())}: Focus {window.class_name}: {window.title}')
 
     def _close_windows_switcher(self):
         if self._windows_switcher:
             self._windows_switcher.close()
         self._windows_switcher = None
 
-    def escape_pressed(self):
+    def escape_pressed(self, timestamp: int):
         if self._windows_switcher:
             self._windows_switcher.close()
             self._windows_switcher = None
 
 
 def main():
+    try:
+        resources.load()
+    except resources.ResourcesNotCompiledError as error:
+        sys.exit(str(error))
     MonKey().start()
 
 
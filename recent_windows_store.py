@@ -0,0 +1,61 @@
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Tuple
+
+from gi.repository import GLib
+
+from window_manager import WindowManager
+
+
+class RecentWindowsStore:
+    _SNAPSHOT_INTERVAL_SECONDS = 30
+
+    def __init__(self, path: Path, window_manager: WindowManager):
+        self._path = path
+        self._window_manager = window_manager
+        # Snapshots are taken on the main loop, but written by a single thread so the main loop never waits on disk
+        self._writer = ThreadPoolExecutor(max_workers=1)
+        self._last_snapshot = None
+        self._snapshot_source = None
+
+    def load(self) -> List[Tuple[int, int, str, str]]:
+        try:
+            with self._path.open('r') as snapshot_file:
+                return [(int(xid), int(pid), str(class_name), str(title))
+                        for xid, pid, class_name, title in json.load(snapshot_file)]
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError, TypeError):
+            logging.exception(f'Failed loading recent windows from {self._path}')
+            return []
+
+    def start(self):
+        self._snapshot_source = GLib.timeout_add_seconds(self._SNAPSHOT_INTERVAL_SECONDS, self._save_snapshot)
+
+    def stop(self):
+        if self._snapshot_source:
+            GLib.source_remove(self._snapshot_source)
+            self._snapshot_source = None
+        self._save_snapshot()
+        self._writer.shutdown(wait=True)
+
+    def _save_snapshot(self):
+        snapshot = self._window_manager.recent_windows_snapshot()
+        if snapshot != self._last_snapshot:
+            self._last_snapshot = snapshot
+            self._writer.submit(self._write, snapshot)
+        return True
+
+    def _write(self, snapshot):
+        # Written aside and then renamed, so a crash mid-write never leaves a truncated snapshot
+        temporary_path = self._path.with_suffix('.tmp')
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with temporary_path.open('w') as snapshot_file:
+                json.dump(snapshot, snapshot_file, separators=(',', ':'))
+            os.replace(temporary_path, self._path)
+        except OSError:
+            logging.exception(f'Failed saving recent windows to {self._path}')
@@ -6,6 +6,7 @@ from configuration import Configuration
 from desktop_entry import DesktopEntry
 from key_binder import KeyBinder
 from keys import Modifier
+from . import resources
 
 
 class PreferencesDialog:
@@ -15,7 +16,7 @@ class PreferencesDialog:
         self._key_binder = key_binder
         self._desktop_entry = DesktopEntry()
         builder = Gtk.Builder()
-        builder.add_from_file('ui/glade_files/preferences-dialog.glade')
+        builder.add_from_resource(resources.path('preferences-dialog.glade'))
 
         self._dialog = builder.get_object('dialog')
         self._box_modifier_buttons = builder.get_object('box_modifierButtons')
@@ -0,0 +1,41 @@
+import logging
+from pathlib import Path
+from xml.etree import ElementTree
+
+from gi.repository import Gio
+
+_UI_PATH = Path(__file__).parent
+_MANIFEST_PATH = _UI_PATH / 'monkey.gresource.xml'
+_BUNDLE_PATH = _UI_PATH / 'monkey.gresource'
+_SOURCE_DIRS = [_UI_PATH / 'glade_files', _UI_PATH.parent / 'files']
+_PREFIX = '/com/github/adi_benz/monkey/'
+
+
+class ResourcesNotCompiledError(Exception):
+    pass
+
+
+def load():
+    # All the UI assets are read from one bundle instead of the working directory. It's compiled by
+    # files/compile-resources.sh, which files/monkey-run.sh runs before starting MonKey whenever the bundle is
+    # outdated, so MonKey itself only reads it.
+    if not _BUNDLE_PATH.exists():
+        raise ResourcesNotCompiledError(f'The UI resources bundle {_BUNDLE_PATH} is missing, build it with '
+                                        f'files/compile-resources.sh (requires glib-compile-resources from '
+                                        f'libglib2.0-bin)')
+    if _is_bundle_outdated():
+        logging.warning(f'The UI resources bundle {_BUNDLE_PATH} is older than its sources, rebuild it with '
+                        f'files/compile-resources.sh')
+    Gio.Resource.load(str(_BUNDLE_PATH))._register()
+
+
+def path(name: str) -> str:
+    return _PREFIX + name
+
+
+def _is_bundle_outdated() -> bool:
+    bundle_modified = _BUNDLE_PATH.stat().st_mtime
+    # Only the files listed in the manifest are compiled into the bundle, editing any other file doesn't outdate it
+    names = [file.text for file in ElementTree.parse(_MANIFEST_PATH).iter('file')]
+    sources = [_MANIFEST_PATH] + [source_dir / name for name in names for source_dir in _SOURCE_DIRS]
+    return any(source.is_file() and source.stat().st_mtime > bundle_modified for source in sources)
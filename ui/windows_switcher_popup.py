@@ -3,59 +3,70 @@ import gi
 gi.require_versions({"Gtk": "3.0", "Keybinder": "3.0", "Wnck": "3.0"})
 from gi.repository import Gtk, Gdk
 
+from . import resources
+
 
 class WindowsSwitcherPopup:
+    _style_provider = None
+    _NAME_COLUMN = 0
+    _WORKSPACE_COLUMN = 1
 
     def __init__(self):
-        provider = Gtk.CssProvider()
-        provider.load_from_path("ui/glade_files/style.css")
-        Gtk.StyleContext.add_provider_for_screen(Gdk.Screen.get_default(), provider,
-                                                 Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
+        self._add_style_provider()
 
         builder = Gtk.Builder()
-        builder.add_from_file('ui/glade_files/window-switcher-popup.glade')
+        builder.add_from_resource(resources.path('window-switcher-popup.glade'))
 
         self._window = builder.get_object('popup-window')
-        self._list_box = builder.get_object('windows-list')
+        # The tree view is in fixed height mode, so only the visible rows are ever measured and drawn
+        self._tree_view = builder.get_object('windows-list')
+        self._windows_store = builder.get_object('windows-store')
         self._app_icon_image = builder.get_object('app-icon')
         self._app_name_label = builder.get_object('app-name')
-        self._windows = []
+        # List store iterators persist, so rows are selected and removed by window without searching for them
+        self._rows = {}
         self._window.hide()
 
+    @classmethod
+    def _add_style_provider(cls):
+        # The style applies to the whole screen, so it's only loaded for the first popup
+        if cls._style_provider:
+            return
+        cls._style_provider = Gtk.CssProvider()
+        cls._style_provider.load_from_resource(resources.path('style.css'))
+        Gtk.StyleContext.add_provider_for_screen(Gdk.Screen.get_default(), cls._style_provider,
+                                                 Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
+
     def show(self, windows):
-        self._windows = windows
-        for window in self._windows:
-            self._list_box.add(WindowListBoxRow(window.get_name(), window.get_workspace().get_name()))
-        if any(self._windows):
-            self._app_name_label.set_label(self._windows[0].get_class_group_name())
-            app_icon = self._windows[0].get_icon()
-            if app_icon:
-                self._app_icon_image.set_from_pixbuf(app_icon)
+        # Detach the store while filling it, so the view isn't notified of every row
+        self._tree_view.set_model(None)
+        for window in windows:
+            self._rows[window] = self._windows_store.append([window.title, window.workspace_name])
+        self._tree_view.set_model(self._windows_store)
         self._window.show_all()
 
+    def show_app(self, class_name, app_icon):
+        self._app_name_label.set_label(class_name)
+        if app_icon:
+            self._app_icon_image.set_from_pixbuf(app_icon)
+        else:
+            # Don't leave the icon of the previously shown class next to this one
+            self._app_icon_image.clear()
+
     def close(self):
-        for child in self._list_box.get_children()[::-1]:
-            self._list_box.remove(child)
+        self._rows.clear()
         self._window.close()
 
     def select(self, window):
-        index = self._windows.index(window)
-        self._list_box.select_row(self._list_box.get_children()[index])
+        row = self._rows[window]
+        self._tree_view.get_selection().select_iter(row)
+        self._tree_view.scroll_to_cell(self._windows_store.get_path(row), None, False, 0, 0)
 
-    def remove(self, window):
-        index = self._windows.index(window)
-        self._windows.remove(window)
-        self._list_box.remove(self._list_box.get_children()[index])
+    def update(self, window):
+        # Titles and workspaces change while switching, only the changed window's row is updated
+        row = self._rows.get(window)
+        if row is not None:
+            self._windows_store.set(row, self._NAME_COLUMN, window.title, self._WORKSPACE_COLUMN, window.workspace_name)
 
-
-class WindowListBoxRow(Gtk.ListBoxRow):
-
-    def __init__(self, window_name, workspace_name):
-        super(Gtk.ListBoxRow, self).__init__()
-        builder = Gtk.Builder()
-        builder.add_from_file('ui/glade_files/list-item.glade')
-
-        list_item = builder.get_object('list-item')
-        self.add(list_item)
-        builder.get_object('label-window-name').set_label(window_name)
-        builder.get_object('label-workspace-name').set_label(workspace_name)
+    def remove(self, window):
+        self._windows_store.remove(self._rows.pop(window))
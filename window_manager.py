@@ -1,54 +1,190 @@
+import abc
 import logging
-from collections import defaultdict
+from abc import ABC
+from collections import defaultdict, OrderedDict
+from enum import Enum
+from typing import Callable, Iterable, List, Optional, Tuple
 
-import gi
-gi.require_versions({"Gtk": "3.0", "Keybinder": "3.0", "Wnck": "3.0"})
-from gi.repository import Gtk, Wnck, Keybinder, GdkX11, Gdk
+from gi.repository import GLib
 
+from hotkey import ALL_WINDOWS, RECENT_WINDOW_PER_CLASS
+from window_record import WindowRecord
 
-class WindowManager:
+
+class _WindowEvent(Enum):
+    OPENED = 'opened'
+    CLOSED = 'closed'
+    ACTIVATED = 'activated'
+
+
+class WindowManager(ABC):
 
     def __init__(self):
-        self._windows = defaultdict(list)
-        self._screen = Wnck.Screen.get_default()
-        self._screen.force_update()
+        # All the registries keep the most recently used entry last, so reordering one is O(1)
+        self._windows = defaultdict(OrderedDict)
+        # Maps each window to the class it was registered under, which may have changed since
+        self._recent_windows = OrderedDict()
+        self._records = {}
+        # Only the windows shown by the open switcher are watched for changes
+        self._watched_records = set()
+        self._record_watcher = None
+        # Window events come in bursts of hundreds at login or when a session is restored, so they're queued and
+        # applied together once the main loop is idle, or as soon as the registries are read
+        self._pending_events = []
+        self._pending_events_source = None
 
+    @abc.abstractmethod
     def start(self):
-        self._screen.connect('active-window-changed', self._active_window_changed)
-        self._screen.connect('window-opened', self._window_opened)
-        self._screen.connect('window-closed', self._window_closed)
+        pass
 
-        for window in self._screen.get_windows():
-            self._add_window(window)
+    @abc.abstractmethod
+    def get_active_window(self) -> Optional[WindowRecord]:
+        pass
+
+    @abc.abstractmethod
+    def activate_window(self, window: WindowRecord, timestamp: int):
+        pass
 
-    def get_active_window(self):
-        return self._screen.get_active_window()
+    @abc.abstractmethod
+    def get_icon(self, window: WindowRecord):
+        pass
 
-    def _window_opened(self, _, window):
-        self._windows[window.get_class_group_name()].append(window)
+    def recent_windows_snapshot(self) -> List[Tuple[int, int, str, str]]:
+        self._apply_pending_events()
+        return [(window.xid, window.pid, window.class_name, window.title) for window in reversed(self._recent_windows)]
 
-    def _window_closed(self, _, window):
-        try:
-            self._windows[window.get_class_group_name()].remove(window)
-        except ValueError:
-            pass
+    def restore_recent_windows(self, saved_windows: List[Tuple[int, int, str, str]]):
+        # Orders the live windows by a snapshot taken before MonKey restarted, in one pass over them. Windows missing
+        # from the snapshot are less recent than the restored ones, but keep their order among themselves.
+        self._apply_pending_events()
+        saved_ranks = {self._saved_window_key(*saved_window): rank for rank, saved_window in enumerate(saved_windows)}
+        restored_windows = [None] * len(saved_windows)
+        new_windows = []
+        for window in reversed(self._recent_windows):
+            rank = saved_ranks.get(self._saved_window_key(window.xid, window.pid, window.class_name, window.title))
+            if rank is None:
+                new_windows.append(window)
+            else:
+                restored_windows[rank] = window
+        recent_windows = [window for window in restored_windows if window] + new_windows
 
-    def _active_window_changed(self, screen, _):
-        active_window = screen.get_active_window()
+        for window in reversed(recent_windows):
+            self._add_window(window)
+        active_window = self.get_active_window()
         if active_window:
-            logging.debug(f'Focus changed to {active_window.get_name()}')
             self._add_window(active_window)
+        logging.info(f'Restored the order of {len(recent_windows) - len(new_windows)} out of {len(recent_windows)} '
+                     f'windows')
+
+    @staticmethod
+    def _saved_window_key(xid: int, pid: int, class_name: str, title: str):
+        # XIDs are reused once windows are closed, the PID and class tell a restored window from a new one. Windows
+        # that don't report their PID are told apart by their title instead.
+        return xid, pid, class_name, None if pid else title
+
+    def watch_records(self, windows: Iterable[WindowRecord], record_changed: Callable[[WindowRecord], None]):
+        self._watched_records = set(windows)
+        self._record_watcher = record_changed
+
+    def unwatch_records(self):
+        self._watched_records = set()
+        self._record_watcher = None
+
+    def _record_changed(self, window: WindowRecord):
+        if window in self._watched_records:
+            self._record_watcher(window)
+
+    def _window_class_changed(self, window: WindowRecord, class_name: str):
+        # The window keeps its place among the recent windows and only moves to its new class's registry. Class changes
+        # are rare, so that registry is rebuilt from the recent windows rather than patched in place.
+        self._apply_pending_events()
+        window.class_name = class_name
+        former_class_name = self._recent_windows.get(window)
+        if former_class_name is None:
+            return
+        self._windows[former_class_name].pop(window, None)
+        self._recent_windows[window] = class_name
+        self._windows[class_name] = OrderedDict(
+            (recent_window, None) for recent_window, recent_class in self._recent_windows.items()
+            if recent_class == class_name)
+
+    def _window_opened(self, window):
+        self._queue_event(_WindowEvent.OPENED, window)
+
+    def _window_closed(self, window):
+        self._queue_event(_WindowEvent.CLOSED, window)
+
+    def _window_activated(self, window):
+        self._queue_event(_WindowEvent.ACTIVATED, window)
+
+    def _queue_event(self, window_event, window):
+        self._pending_events.append((window_event, window))
+        if not self._pending_events_source:
+            self._pending_events_source = GLib.idle_add(self._pending_events_idle)
+
+    def _pending_events_idle(self):
+        self._pending_events_source = None
+        self._apply_pending_events()
+        return False
+
+    def _apply_pending_events(self):
+        if not self._pending_events:
+            return
+        if self._pending_events_source:
+            GLib.source_remove(self._pending_events_source)
+            self._pending_events_source = None
+        events, self._pending_events = self._pending_events, []
+
+        # Only the last event of every window decides where it ends up
+        last_events = {}
+        for index, (window_event, window) in enumerate(events):
+            last_events[window] = (index, window_event)
+        last_events = sorted((index, window_event, window) for window, (index, window_event) in last_events.items())
+
+        for _, window_event, window in last_events:
+            if window_event == _WindowEvent.CLOSED:
+                self._remove_window(window)
+            elif window_event == _WindowEvent.OPENED:
+                self._append_window(window)
+            else:
+                self._add_window(window)
+
+        logging.debug(f'Applied {len(events)} window events to {len(last_events)} windows')
+        if last_events[-1][1] == _WindowEvent.ACTIVATED:
+            logging.debug(f'Focus changed to {last_events[-1][2].title}')
+
+    def _append_window(self, window):
+        # A window that was never focused is the least recently used one
+        class_name = window.class_name
+        self._windows[class_name][window] = None
+        self._windows[class_name].move_to_end(window, last=False)
+        self._recent_windows[window] = class_name
+        self._recent_windows.move_to_end(window, last=False)
+
+    def _remove_window(self, window):
+        class_name = self._recent_windows.pop(window, None)
+        if class_name is not None:
+            self._windows[class_name].pop(window, None)
 
     def _add_window(self, window):
-        class_name = window.get_class_group_name()
-        try:
-            self._windows[class_name].remove(window)
-        except ValueError:
-            pass
-        self._windows[class_name].insert(0, window)
+        class_name = window.class_name
+        self._windows[class_name][window] = None
+        self._windows[class_name].move_to_end(window)
+        self._recent_windows[window] = class_name
+        self._recent_windows.move_to_end(window)
 
     def get_windows(self, class_name):
-        return self._windows[class_name]
+        self._apply_pending_events()
+        if class_name == ALL_WINDOWS:
+            return list(reversed(self._recent_windows))
+        if class_name == RECENT_WINDOW_PER_CLASS:
+            # A class is as recent as its most recently used window, so it stays in order as windows are closed
+            recent_window_per_class = {}
+            for window, window_class_name in reversed(self._recent_windows.items()):
+                recent_window_per_class.setdefault(window_class_name, window)
+            return list(recent_window_per_class.values())
+        return list(reversed(self._windows[class_name]))
 
     def contains(self, window):
-        return window in self._windows[window.get_class_group_name()]
+        self._apply_pending_events()
+        return window in self._recent_windows
@@ -0,0 +1,20 @@
+from typing import Optional
+
+
+class WindowRecord:
+    # Copies of the window properties MonKey reads, refreshed by the window manager only when the window reports a
+    # change, so reading them never calls into libwnck
+    __slots__ = ('xid', 'pid', 'class_name', 'title', 'workspace_number', 'workspace_name')
+
+    def __init__(self, xid: int, pid: int, class_name: str, title: str, workspace_number: Optional[int],
+                 workspace_name: str):
+        self.xid = xid
+        self.pid = pid
+        self.class_name = class_name
+        self.title = title
+        # Windows shown on all the workspaces have no workspace number
+        self.workspace_number = workspace_number
+        self.workspace_name = workspace_name
+
+    def __repr__(self):
+        return f'WindowRecord({self.xid:#x}, {self.class_name!r}, {self.title!r})'
@@ -1,6 +1,8 @@
 import logging
 
+from hotkey import CROSS_CLASS_NAMES
 from window_manager import WindowManager
+from window_record import WindowRecord
 from ui.windows_switcher_popup import WindowsSwitcherPopup
 
 
@@ -17,17 +19,28 @@ class WindowsSwitcher:
         self._class_name = class_name
         self._windows = list(self._window_manager.get_windows(self._class_name))
         for window in self._windows:
-            logging.debug(f'\t{window.get_name()}')
+            logging.debug(f'\t{window.title}')
         active_window = self._window_manager.get_active_window()
         if any(self._windows):
             self._windows_switcher_gui = WindowsSwitcherPopup()
             self._windows_switcher_gui.show(self._windows)
+            self._show_app(self._windows[0])
+            self._window_manager.watch_records(self._windows, self._windows_switcher_gui.update)
             self._index = 0
-            if active_window and active_window.get_class_group_name() == class_name:
+            if active_window and self._is_switching_from(active_window):
                 self.select_next()
 
+    def _is_switching_from(self, active_window):
+        if self._class_name in CROSS_CLASS_NAMES:
+            return self._windows[0] == active_window
+        return active_window.class_name == self._class_name
+
+    def _show_app(self, window: WindowRecord):
+        self._windows_switcher_gui.show_app(window.class_name, self._window_manager.get_icon(window))
+
     def close(self):
         if self._windows_switcher_gui:
+            self._window_manager.unwatch_records()
             self._windows_switcher_gui.close()
 
     def get_class_name(self):
@@ -45,6 +58,8 @@ class WindowsSwitcher:
     def _select_current_window(self):
         next_window = self._windows[self._index]
         self._windows_switcher_gui.select(next_window)
+        if self._class_name in CROSS_CLASS_NAMES:
+            self._show_app(next_window)
 
     def selected_window(self):
         self._refresh_windows()
@@ -0,0 +1,97 @@
+from typing import Optional
+
+from Xlib.display import Display
+
+import gi
+gi.require_versions({"Wnck": "3.0"})
+from gi.repository import Wnck
+
+from ewmh import EwmhRequests
+from window_manager import WindowManager
+from window_record import WindowRecord
+
+
+class WnckWindowManager(WindowManager):
+
+    def __init__(self):
+        super().__init__()
+        self._screen = Wnck.Screen.get_default()
+        self._screen.force_update()
+        self._wnck_windows = {}
+        # Wnck syncs with the X server after every request it sends, so activation requests are sent directly
+        self._ewmh_requests = EwmhRequests(Display())
+
+    def start(self):
+        self._screen.connect('active-window-changed', self._active_window_changed)
+        self._screen.connect('window-opened', self._screen_window_opened)
+        self._screen.connect('window-closed', self._screen_window_closed)
+        self._screen.connect('workspace-created', self._workspace_created)
+        for workspace in self._screen.get_workspaces():
+            self._workspace_created(self._screen, workspace)
+
+        for window in self._screen.get_windows():
+            self._add_window(self._register_window(window))
+
+    def get_active_window(self) -> Optional[WindowRecord]:
+        active_window = self._screen.get_active_window()
+        return self._records.get(active_window.get_xid()) if active_window else None
+
+    def activate_window(self, window: WindowRecord, timestamp: int):
+        active_workspace = self._screen.get_active_workspace()
+        if window.workspace_number is not None \
+                and (not active_workspace or window.workspace_number != active_workspace.get_number()):
+            self._ewmh_requests.activate_window(window.xid, timestamp, window.workspace_number)
+        else:
+            self._ewmh_requests.activate_window(window.xid, timestamp)
+
+    def get_icon(self, window: WindowRecord):
+        wnck_window = self._wnck_windows.get(window.xid)
+        return wnck_window.get_icon() if wnck_window else None
+
+    def _register_window(self, wnck_window) -> WindowRecord:
+        workspace = wnck_window.get_workspace()
+        window = WindowRecord(wnck_window.get_xid(), wnck_window.get_pid(), wnck_window.get_class_group_name(),
+                              wnck_window.get_name(), workspace.get_number() if workspace else None,
+                              workspace.get_name() if workspace else '')
+        self._records[window.xid] = window
+        self._wnck_windows[window.xid] = wnck_window
+        wnck_window.connect('name-changed', self._name_changed, window)
+        wnck_window.connect('workspace-changed', self._workspace_changed, window)
+        wnck_window.connect('class-changed', self._class_changed, window)
+        return window
+
+    def _screen_window_opened(self, _, wnck_window):
+        self._window_opened(self._register_window(wnck_window))
+
+    def _screen_window_closed(self, _, wnck_window):
+        self._wnck_windows.pop(wnck_window.get_xid(), None)
+        window = self._records.pop(wnck_window.get_xid(), None)
+        if window:
+            self._window_closed(window)
+
+    def _active_window_changed(self, _screen, _previous_window):
+        active_window = self.get_active_window()
+        if active_window:
+            self._window_activated(active_window)
+
+    def _name_changed(self, wnck_window, window: WindowRecord):
+        window.title = wnck_window.get_name()
+        self._record_changed(window)
+
+    def _workspace_changed(self, wnck_window, window: WindowRecord):
+        workspace = wnck_window.get_workspace()
+        window.workspace_number = workspace.get_number() if workspace else None
+        window.workspace_name = workspace.get_name() if workspace else ''
+        self._record_changed(window)
+
+    def _class_changed(self, wnck_window, window: WindowRecord):
+        self._window_class_changed(window, wnck_window.get_class_group_name())
+
+    def _workspace_created(self, _, workspace):
+        workspace.connect('name-changed', self._workspace_renamed)
+
+    def _workspace_renamed(self, workspace):
+        for window in self._records.values():
+            if window.workspace_number == workspace.get_number():
+                window.workspace_name = workspace.get_name()
+                self._record_changed(window)
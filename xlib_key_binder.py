@@ -1,23 +1,51 @@
+import logging
+import os
+import struct
+import subprocess
+import sys
 import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Collection, Optional
 
 from Xlib import X
 from Xlib.display import Display
 from Xlib.ext import record
 from Xlib.protocol import rq
 
+import hold_listener_process
+from autorepeat import elapsed_ms
+
 import gi
-gi.require_versions({"Keybinder": "3.0"})
+gi.require_versions({"Gtk": "3.0", "Keybinder": "3.0"})
 from gi.repository import Keybinder as XlibKeybinder
-from gi.repository import GLib
+from gi.repository import GLib, Gtk
 
 
 class XlibKeyBinder:
+    _LISTENER_PROCESS_PATH = Path(__file__).parent / 'hold_listener_process.py'
+    _LISTENER_READ_SIZE = hold_listener_process.EVENT_SIZE * 512
+    # A listener process exiting sooner than this after starting is assumed to keep failing, so it isn't restarted
+    _LISTENER_PROCESS_MIN_UPTIME_SECONDS = 10
+    # Enough release times per key to still hold a deliberate release while autorepeat pairs pile up after it
+    _RELEASE_TIMES_KEPT = 8
 
-    def __init__(self):
+    def __init__(self, listener_process_keysyms: Optional[Collection[int]] = None):
+        # When given, hold keys are listened for in a child process that forwards only these keysyms, so it doesn't
+        # compete with GTK over the GIL. Otherwise they are listened for in a thread of this process.
         self._hold_keys = {}
-        self._display = Display()
+        self._display = None
         self._keys_bindings = []
+        self._bindings_keysyms = {}
+        self._press_times = {}
+        # Filled by the listener, which unlike Keybinder sees the releases of the bound keys too
+        self._release_times = defaultdict(lambda: deque(maxlen=self._RELEASE_TIMES_KEPT))
         self._context = None
+        self._listener_process_keysyms = listener_process_keysyms
+        self._listener_process = None
+        self._listener_process_started_at = None
+        self._listener_process_source = None
 
     def listen_hold(self, key, pressed_callback, released_callback):
         self._hold_keys[key] = (pressed_callback, released_callback)
@@ -29,40 +57,76 @@ class XlibKeyBinder:
         bind_successful = XlibKeybinder.bind(key_combination, pressed_callback, *args)
         if bind_successful:
             self._keys_bindings.append(key_combination)
+            self._bindings_keysyms[key_combination], _ = Gtk.accelerator_parse(key_combination)
+            self._send_bindings_keysyms()
         return bind_successful
 
+    def current_event_time(self) -> int:
+        # Server time of the key event that triggered the binding callback being run
+        return XlibKeybinder.get_current_event_time()
+
+    def is_autorepeat(self, key_combination) -> bool:
+        # Must be called from the binding callback. A press is an autorepeat when its key wasn't released since its
+        # previous press. Without detectable autorepeat X also releases the key before every repeated press, with
+        # the same timestamp as the press, so releases at either press's time don't count.
+        keysym = self._bindings_keysyms[key_combination]
+        press_time = self.current_event_time()
+        last_press_time = self._press_times.get(keysym)
+        self._press_times[keysym] = press_time
+        if last_press_time is None:
+            return False
+        since_last_press = elapsed_ms(last_press_time, press_time)
+        return not any(0 < elapsed_ms(last_press_time, release_time) < since_last_press
+                       for release_time in tuple(self._release_times[keysym]))
+
     def clear_bindings(self):
         for key_binding in self._keys_bindings:
             XlibKeybinder.unbind(key_binding)
         self._keys_bindings.clear()
+        self._bindings_keysyms.clear()
+        self._send_bindings_keysyms()
+
+    def _send_bindings_keysyms(self):
+        # The listener process only forwards the releases of the bound keys, which is all is_autorepeat needs
+        if not self._listener_process:
+            return
+        line = ' '.join(str(keysym) for keysym in set(self._bindings_keysyms.values())) + '\n'
+        try:
+            self._listener_process.stdin.write(line.encode())
+            self._listener_process.stdin.flush()
+        except BrokenPipeError:
+            # The listener process exited, it's sent the keysyms again once it's restarted
+            pass
 
     def start(self):
         XlibKeybinder.init()
-        listener_thread = threading.Thread(target=self._start_hold_listen)
-        listener_thread.setDaemon(True)
-        listener_thread.start()
+        if self._listener_process_keysyms is not None:
+            self._start_listener_process()
+        else:
+            self._start_listener_thread()
 
     def stop(self):
         self.clear_bindings()
         self.clear_listen_hold()
+        if self._listener_process:
+            GLib.source_remove(self._listener_process_source)
+            self._listener_process.terminate()
+            self._listener_process.wait()
+            self._close_listener_process_pipes()
+            self._listener_process = None
+            return
         self._display.record_disable_context(self._context)
         self._display.flush()
 
+    def _start_listener_thread(self):
+        self._display = Display()
+        listener_thread = threading.Thread(target=self._start_hold_listen)
+        listener_thread.setDaemon(True)
+        listener_thread.start()
+
     def _start_hold_listen(self):
-        self._context = self._display.record_create_context(
-            0,
-            [record.AllClients],
-            [{
-                'core_requests': (0, 0),
-                'core_replies': (0, 0),
-                'ext_requests': (0, 0, 0, 0),
-                'ext_replies': (0, 0, 0, 0),
-                'delivered_events': (0, 0),
-                'device_events': (X.KeyReleaseMask, X.ButtonReleaseMask),
-                'errors': (0, 0),
-                'client_started': False,
-                'client_died': False,
-            }])
+        self._context = self._display.record_create_context(0, [record.AllClients],
+                                                            hold_listener_process.RECORD_RANGES)
         self._display.record_enable_context(self._context, self._event_handler)
         self._display.record_free_context(self._context)
         self._display.close()
@@ -73,12 +137,65 @@ class XlibKeyBinder:
             event, data = rq.EventField(None).parse_binary_value(data, self._display.display, None, None)
 
             keysym = self._display.keycode_to_keysym(event.detail, 0)
+            if event.type == X.KeyRelease:
+                self._release_times[keysym].append(event.time)
+            callback = self._hold_callback(keysym, event.type)
+            if callback:
+                # Delivered at the same priority as the listener process's events, ahead of idle and redraw work
+                GLib.idle_add(callback, event.time, priority=GLib.PRIORITY_HIGH)
+
+    def _start_listener_process(self):
+        self._listener_process = subprocess.Popen(
+            [sys.executable, str(self._LISTENER_PROCESS_PATH), *map(str, self._listener_process_keysyms)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self._listener_process_started_at = time.monotonic()
+        self._listener_process_source = GLib.io_add_watch(
+            self._listener_process.stdout.fileno(), GLib.PRIORITY_HIGH, GLib.IOCondition.IN | GLib.IOCondition.HUP,
+            self._listener_process_events_ready)
+        self._send_bindings_keysyms()
+
+    def _listener_process_events_ready(self, fd, _condition):
+        # Writes of whole events are atomic, so reading a multiple of the event size never splits one
+        data = os.read(fd, self._LISTENER_READ_SIZE)
+        if not data:
+            self._listener_process_exited()
+            return False
+        for keysym, event_type, event_time in struct.iter_unpack(hold_listener_process.EVENT_FORMAT, data):
+            if event_type == X.KeyRelease:
+                self._release_times[keysym].append(event_time)
+            # We're already on the main loop, so there is no need to defer the callback
+            callback = self._hold_callback(keysym, event_type)
+            if callback:
+                callback(event_time)
+        return True
+
+    def _listener_process_exited(self):
+        # Without a listener the modifier release never arrives, and an open switcher could never be closed
+        exit_code = self._listener_process.wait()
+        self._close_listener_process_pipes()
+        self._listener_process = None
+        uptime = time.monotonic() - self._listener_process_started_at
+        if uptime < self._LISTENER_PROCESS_MIN_UPTIME_SECONDS:
+            logging.error(f'Hold keys listener process exited with {exit_code} after {uptime:.1f}s, '
+                          f'listening in a thread instead')
+            self._start_listener_thread()
+        else:
+            logging.warning(f'Hold keys listener process exited with {exit_code}, restarting it')
+            self._start_listener_process()
+
+    def _close_listener_process_pipes(self):
+        try:
+            self._listener_process.stdin.close()
+        except BrokenPipeError:
+            pass
+        self._listener_process.stdout.close()
 
-            if keysym in self._hold_keys.keys():
-                pressed_callback, released_callback = self._hold_keys[keysym]
-                if event.type == X.KeyPress:
-                    if pressed_callback:
-                        GLib.idle_add(pressed_callback)
-                elif event.type == X.KeyRelease:
-                    if released_callback:
-                        GLib.idle_add(released_callback)
+    def _hold_callback(self, keysym, event_type):
+        if keysym not in self._hold_keys.keys():
+            return None
+        pressed_callback, released_callback = self._hold_keys[keysym]
+        if event_type == X.KeyPress:
+            return pressed_callback
+        elif event_type == X.KeyRelease:
+            return released_callback
+        return None